@@ -1,164 +1,218 @@
+import asyncio
 import datetime
+import functools
 import logging.config
+import threading
 from environs import Env
 from seller import download_stock
 
+import httpx
+import ijson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-from seller import divide, price_conversion
+from seller import (
+    create_client,
+    divide,
+    prices_conversion,
+    send_chunks,
+    stock_conversion,
+)
 
 logger = logging.getLogger(__file__)
 
+_MARKET_BASE = "https://api.partner.market.yandex.ru/"
+# Одновременных запросов при отправке частей на Yandex market.
+# Остатки уходят крупными частями по 2000 шт., каждая часть тяжёлая
+# для API, поэтому держим 2. Цены частями по 500 шт. — 4.
+_MARKET_STOCKS_LIMIT = 2
+_MARKET_PRICES_LIMIT = 4
 
-def get_product_list(page, campaign_id, access_token):
-    """Получает список товаров из Yandex market.
+_LOCAL = threading.local()
+
+
+def _session():
+    """Возвращает requests сессию текущего потока.
+
+    Кампании FBS и DBS получают артикулы одновременно в разных потоках,
+    а requests.Session не гарантирует потокобезопасность.
+    Поэтому у каждого потока своя сессия со своим пулом соединений.
+
+    Returns:
+        requests.Session: Сессия для запросов к API Yandex market.
+    """
+    session = getattr(_LOCAL, "session", None)
+    if session is None:
+        session = requests.Session()
+        session.headers.update({"Content-Type": "application/json"})
+        session.mount(
+            _MARKET_BASE,
+            HTTPAdapter(
+                pool_connections=4,
+                pool_maxsize=16,
+                max_retries=Retry(
+                    total=5,
+                    backoff_factor=0.5,
+                    status_forcelist=(429, 500, 502, 503, 504),
+                    allowed_methods=("GET", "PUT", "POST"),
+                    respect_retry_after_header=True,
+                    # Таймаут чтения не повторяем: запрос мог уже дойти до API,
+                    # а requests поднимет ReadTimeout, а не ConnectionError.
+                    read=False,
+                ),
+            ),
+        )
+        _LOCAL.session = session
+    return session
 
-    Функция делает GET запрос к API Yandex market,
-    для получения списка товаров.
-    Список начинается с указанной страницы page.
-    За один раз скачивает не более 200 товаров.
+
+@functools.lru_cache(maxsize=4)
+def _headers(access_token):
+    """Возвращает заголовки авторизации для API Yandex market.
 
     Args:
-        page (str): Токен обозначающий номер страници.
-        campaign_id (str): Ваш индивидуальный id компании для Yandex market.
         access_token (str): Ваш индивидуальный токен для Yandex market.
 
     Returns:
-        dict: Словарь полученный из Yandex market API
-        с списком товаров и данными о пагинации.
-
-    Raises:
-        requests.HTTPError: Если в запросе произошла ошибка.
+        dict: Заголовки запроса. Словарь общий для всех вызовов, его нельзя менять.
     """
-    endpoint_url = "https://api.partner.market.yandex.ru/"
-    headers = {
-        "Content-Type": "application/json",
+    return {
         "Authorization": f"Bearer {access_token}",
         "Accept": "application/json",
-        "Host": "api.partner.market.yandex.ru",
-    }
-    payload = {
-        "page_token": page,
-        "limit": 200,
     }
-    url = endpoint_url + f"campaigns/{campaign_id}/offer-mapping-entries"
-    response = requests.get(url, headers=headers, params=payload)
-    response.raise_for_status()
-    response_object = response.json()
-    return response_object.get("result")
 
 
-def update_stocks(stocks, campaign_id, access_token):
-    """Обновить остатки товаров на Yandex market.
+def get_offer_page(page, campaign_id, access_token):
+    """Получает одну страницу артикулов товаров из Yandex market.
 
-    Функция с помощью PUT метода к API Yandex market обновляет информацию
-    о количестве товара. Нагрузкой По 2000 шт. товара за раз.
+    Функция делает GET запрос к API Yandex market,
+    для получения списка товаров.
+    Список начинается с указанной страницы page.
+    За один раз скачивает не более 200 товаров.
+    Ответ не превращается в словарь целиком: JSON разбирается потоково,
+    из него берутся только артикулы и токен следующей страницы.
 
     Args:
-        stocks list[dict]: Список словарей с информацией об остатках товара.
+        page (str): Токен обозначающий номер страници.
         campaign_id (str): Ваш индивидуальный id компании для Yandex market.
         access_token (str): Ваш индивидуальный токен для Yandex market.
 
     Returns:
-        dict: Словарь с обновленным списком остатков товаров.
+        tuple: Список артикулов SKU со страницы
+        и токен следующей страницы (None, если страница последняя).
 
     Raises:
-        requests.HTTPError: Если в запросе к API произошла ошибка.
+        requests.HTTPError: Если в запросе произошла ошибка.
+        ijson.JSONError: Если ответ не удалось разобрать.
     """
-    endpoint_url = "https://api.partner.market.yandex.ru/"
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {access_token}",
-        "Accept": "application/json",
-        "Host": "api.partner.market.yandex.ru",
+    payload = {
+        "page_token": page,
+        "limit": 200,
     }
-    payload = {"skus": stocks}
-    url = endpoint_url + f"campaigns/{campaign_id}/offers/stocks"
-    response = requests.put(url, headers=headers, json=payload)
-    response.raise_for_status()
-    response_object = response.json()
-    return response_object
-
-
-def update_price(prices, campaign_id, access_token):
-    """Обновить цены товаров на Yandex market.
-
-    Функция с помощью POST метода к Yandex market API обновляет цены
-    в полученном списке товаров и возвращает словарь списков.
+    url = f"{_MARKET_BASE}campaigns/{campaign_id}/offer-mapping-entries"
+    skus = []
+    next_page = None
+    with _session().get(
+        url, headers=_headers(access_token), params=payload, stream=True
+    ) as response:
+        response.raise_for_status()
+        response.raw.decode_content = True
+        for prefix, _, value in ijson.parse(response.raw):
+            if prefix == "result.offerMappingEntries.item.offer.shopSku":
+                skus.append(value)
+            elif prefix == "result.paging.nextPageToken":
+                next_page = value
+    return skus, next_page
+
+
+def iter_offer_ids(campaign_id, market_token):
+    """Перебирает артикулы товаров Yandex market.
+
+    Функция вызывает get_offer_page и получает артикулы
+    товаров из Yandex Маркет по 200 шт за раз.
+    Вызывает функцию до тех пор пока не закончатся страницы с товарами.
+    Артикулы отдаются по одному, поэтому в памяти
+    хранится не больше одной страницы артикулов.
 
     Args:
-        prices list[dict]: Список с ценами на товар.
-        campaign_id (str): Ваш индивидуальный id компании для Yandex market.
-        access_token (str): Ваш индивидуальный токен для Yandex market.
+        campaign_id (str): Ваш индивидуальный id компании с Yandex market.
+        market_token (str): Ваш индивидуальный токен с Yandex market.
 
-    Returns:
-        dict: Словарь с информацией о статусе обновления цен.
+    Yields:
+        str: Артикул товара SKU(внутренний ID карточки товара) Yandex market.
 
     Raises:
         requests.HTTPError: Если в запросе к API произошла ошибка.
+        ijson.JSONError: Если ответ не удалось разобрать.
     """
-    endpoint_url = "https://api.partner.market.yandex.ru/"
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {access_token}",
-        "Accept": "application/json",
-        "Host": "api.partner.market.yandex.ru",
-    }
-    payload = {"offers": prices}
-    url = endpoint_url + f"campaigns/{campaign_id}/offer-prices/updates"
-    response = requests.post(url, headers=headers, json=payload)
-    response.raise_for_status()
-    response_object = response.json()
-    return response_object
+    page = ""
+    while True:
+        skus, page = get_offer_page(page, campaign_id, market_token)
+        yield from skus
+        if not page:
+            break
 
 
 def get_offer_ids(campaign_id, market_token):
     """Получить артикулы товаров  Yandex market.
 
-    Функция вызывает get_product_list получает словарь
-    со списком товаров из Yandex Маркет по 200 шт за раз.
-    Вызывает функцию до тех пор пока не закончатся страницы с товарами.
-    Далее созаёт список артикулов Sku товаров с Yandex market.
+    Функция собирает в множество артикулы, полученные из iter_offer_ids.
+    Множество строится один раз и передаётся в create_stocks и create_prices.
 
     Args:
         campaign_id (str): Ваш индивидуальный id компании с Yandex market.
         market_token (str): Ваш индивидуальный токен с Yandex market.
 
     Returns:
-        list: Список артикулов товаров SKU(внутренний ID карточки товара) Yandex market.
+        set: Множество артикулов товаров SKU(внутренний ID карточки товара) Yandex market.
 
     Raises:
         requests.HTTPError: Если в запросе к API произошла ошибка.
-        KeyError: Если в словаре отсутствуют ожидаемые ключи.
+        ijson.JSONError: Если ответ не удалось разобрать.
     """
-    page = ""
-    product_list = []
-    while True:
-        some_prod = get_product_list(page, campaign_id, market_token)
-        product_list.extend(some_prod.get("offerMappingEntries"))
-        page = some_prod.get("paging").get("nextPageToken")
-        if not page:
-            break
-    offer_ids = []
-    for product in product_list:
-        offer_ids.append(product.get("offer").get("shopSku"))
-    return offer_ids
+    return set(iter_offer_ids(campaign_id, market_token))
+
+
+def _make_stock(sku, count, warehouse_id, date):
+    """Создаёт словарь остатка одного товара для Yandex market.
+
+    Args:
+        sku (str): Артикул товара.
+        count (int): Количество товара.
+        warehouse_id (str): ID склада.
+        date (str): Время обновления остатка в формате ISO 8601.
+
+    Returns:
+        dict: Словарь с информацией об остатке товара.
+    """
+    return {
+        "sku": sku,
+        "warehouseId": warehouse_id,
+        "items": [
+            {
+                "count": count,
+                "type": "FIT",
+                "updatedAt": date,
+            }
+        ],
+    }
 
 
 def create_stocks(watch_remnants, offer_ids, warehouse_id):
     """Создаёт список остатков товара.
 
-    Функция обрабатывает данные обоих списков и сравнивает их между собой
+    Функция обрабатывает данные таблицы и списка и сравнивает их между собой
     по артикулам создавая новый список словарей.
-    Изменяет количество товара опираясь на данные из списка watch_remnants:
+    Изменяет количество товара опираясь на данные из таблицы watch_remnants:
     Товаров >10 = 100шт.
     Товар 1 = 0.
     Либо = реальное количество товара.
     Оставшиеся товары из списка Yandex market у которых нет совпадений добавляются с остатком 0.
 
     Args:
-        watch_remnants list[dict]: Список словарей с информацией об остатках товара с timeworld.ru.
-        offer_ids list: Список артикулов товаров SKU(внутренний ID карточки товара) Yandex market.
+        watch_remnants pd.DataFrame: Таблица с информацией об остатках товара с timeworld.ru.
+        offer_ids set: Артикулы товаров SKU(внутренний ID карточки товара) Yandex market.
         warehouse_id (str): ID склада.
 
     Returns:
@@ -167,122 +221,128 @@ def create_stocks(watch_remnants, offer_ids, warehouse_id):
 
     Raises:
         ValueError: Если количество не удалось преобразовать в число.
-        KeyError: Если в словаре отсутствуют ожидаемые ключи.
+        KeyError: Если в таблице отсутствуют ожидаемые столбцы.
     """
     # Уберем то, что не загружено в market
-    stocks = list()
-    date = str(datetime.datetime.utcnow().replace(
-        microsecond=0).isoformat() + "Z")
-    for watch in watch_remnants:
-        if str(watch.get("Код")) in offer_ids:
-            count = str(watch.get("Количество"))
-            if count == ">10":
-                stock = 100
-            elif count == "1":
-                stock = 0
-            else:
-                stock = int(watch.get("Количество"))
-            stocks.append(
-                {
-                    "sku": str(watch.get("Код")),
-                    "warehouseId": warehouse_id,
-                    "items": [
-                        {
-                            "count": stock,
-                            "type": "FIT",
-                            "updatedAt": date,
-                        }
-                    ],
-                }
-            )
-            offer_ids.remove(str(watch.get("Код")))
+    date = (
+        datetime.datetime.now(datetime.timezone.utc)
+        .replace(microsecond=0)
+        .isoformat()
+        .replace("+00:00", "Z")
+    )
+    offer_set = offer_ids if isinstance(offer_ids, set) else set(offer_ids)
+    codes = watch_remnants["Код"].astype(str)
+    matched = codes.isin(offer_set) & ~codes.duplicated()
+    matched_codes = codes[matched].tolist()
+    counts = stock_conversion(watch_remnants.loc[matched, "Количество"])
+    stocks = [
+        _make_stock(code, stock, warehouse_id, date)
+        for code, stock in zip(matched_codes, counts.tolist())
+    ]
     # Добавим недостающее из загруженного:
-    for offer_id in offer_ids:
-        stocks.append(
-            {
-                "sku": offer_id,
-                "warehouseId": warehouse_id,
-                "items": [
-                    {
-                        "count": 0,
-                        "type": "FIT",
-                        "updatedAt": date,
-                    }
-                ],
-            }
-        )
+    remaining = offer_set.difference(matched_codes)
+    stocks.extend(
+        _make_stock(offer_id, 0, warehouse_id, date) for offer_id in remaining
+    )
     return stocks
 
 
 def create_prices(watch_remnants, offer_ids):
     """Создаёт новый список с актуальными ценами на товары.
 
-    Функция перебирает товары в из списка watch_remnants
+    Функция перебирает товары из таблицы watch_remnants
     и сравнивает по id с товарами в списке offer_ids.
     Если id совпадают, то товар отправляется в новый список словарей
-    с обновленной ценой взятой из первого списка.
+    с обновленной ценой взятой из таблицы.
 
     Args:
-        watch_remnants list[dict]: Список словарей с информацией об остатках товара с timeworld.ru.
-        offer_ids list: Список артикулов товаров SKU(внутренний ID карточки товара) Yandex market.
+        watch_remnants pd.DataFrame: Таблица с информацией об остатках товара с timeworld.ru.
+        offer_ids set: Артикулы товаров SKU(внутренний ID карточки товара) Yandex market.
 
     Returns:
         list[dict]: Список словарей с актуальной ценой на товары.
 
     Raises:
-        KeyError: Если в словаре отсутствуют ожидаемые ключи.
+        KeyError: Если в таблице отсутствуют ожидаемые столбцы.
+        ValueError: Если цену не удалось преобразовать в число.
     """
-    prices = []
-    for watch in watch_remnants:
-        if str(watch.get("Код")) in offer_ids:
-            price = {
-                "id": str(watch.get("Код")),
-                # "feed": {"id": 0},
-                "price": {
-                    "value": int(price_conversion(watch.get("Цена"))),
-                    # "discountBase": 0,
-                    "currencyId": "RUR",
-                    # "vat": 0,
-                },
-                # "marketSku": 0,
-                # "shopSku": "string",
-            }
-            prices.append(price)
+    offer_set = offer_ids if isinstance(offer_ids, set) else set(offer_ids)
+    codes = watch_remnants["Код"].astype(str)
+    matched = codes.isin(offer_set)
+    values = prices_conversion(watch_remnants.loc[matched, "Цена"]).astype(int)
+    prices = [
+        {
+            "id": code,
+            # "feed": {"id": 0},
+            "price": {
+                "value": value,
+                # "discountBase": 0,
+                "currencyId": "RUR",
+                # "vat": 0,
+            },
+            # "marketSku": 0,
+            # "shopSku": "string",
+        }
+        for code, value in zip(codes[matched].tolist(), values.tolist())
+    ]
     return prices
 
 
-async def upload_prices(watch_remnants, campaign_id, market_token):
+async def upload_prices(
+    watch_remnants, campaign_id, market_token, offer_ids=None, client=None
+):
     """Обновляет цены товаров на Yandex market.
 
     Args:
-        watch_remnants list[dict]: Список словарей с информацией об остатках товара с timeworld.ru.
+        watch_remnants pd.DataFrame: Таблица с информацией об остатках товара с timeworld.ru.
         campaign_id (str): Ваш индивидуальный id компании для Yandex market.
         market_token (str): Ваш индивидуальный токен с Yandex market.
+        offer_ids set: Артикулы товаров SKU Yandex market.
+            Если не передан, будет получен через get_offer_ids.
+        client (httpx.AsyncClient): Общий клиент из create_client.
 
     Returns:
         list[dict]: Список словарей с актуальной ценой на товары.
 
     Raises:
         requests.HTTPError: Если в запросе к API произошла ошибка.
+        httpx.HTTPStatusError: Если при отправке цен произошла ошибка.
         KeyError: Если в словаре отсутствуют ожидаемые ключи.
-        requests.HTTPError: Если в запросе к API произошла ошибка.
     """
-    offer_ids = get_offer_ids(campaign_id, market_token)
+    if offer_ids is None:
+        offer_ids = await asyncio.to_thread(get_offer_ids, campaign_id, market_token)
     prices = create_prices(watch_remnants, offer_ids)
-    for some_prices in list(divide(prices, 500)):
-        update_price(some_prices, campaign_id, market_token)
+    url = f"{_MARKET_BASE}campaigns/{campaign_id}/offer-prices/updates"
+    await send_chunks(
+        "POST",
+        url,
+        _headers(market_token),
+        "offers",
+        divide(prices, 500),
+        limit=_MARKET_PRICES_LIMIT,
+        client=client,
+    )
     return prices
 
 
-async def upload_stocks(watch_remnants, campaign_id, market_token, warehouse_id):
+async def upload_stocks(
+    watch_remnants,
+    campaign_id,
+    market_token,
+    warehouse_id,
+    offer_ids=None,
+    client=None,
+):
     """Обновляет остатки товаров на Yandex market.
 
     Args:
-        watch_remnants list[dict]: Список словарей с информацией об остатках товара с timeworld.ru.
+        watch_remnants pd.DataFrame: Таблица с информацией об остатках товара с timeworld.ru.
         campaign_id (str): Ваш индивидуальный id компании для Yandex market.
         market_token (str): Ваш индивидуальный токен с Yandex market.
         warehouse_id (str): ID склада.
-
+        offer_ids set: Артикулы товаров SKU Yandex market.
+            Если не передан, будет получен через get_offer_ids.
+        client (httpx.AsyncClient): Общий клиент из create_client.
 
     Returns:
         list[dict]: Общий список словарей с информацией об остатках товаров
@@ -291,19 +351,94 @@ async def upload_stocks(watch_remnants, campaign_id, market_token, warehouse_id)
 
     Raises:
         requests.HTTPError: Если в запросе к API произошла ошибка.
+        httpx.HTTPStatusError: Если при отправке остатков произошла ошибка.
         KeyError: Если в словаре отсутствуют ожидаемые ключи.
         ValueError: Если количество не удалось преобразовать в число.
     """
-    offer_ids = get_offer_ids(campaign_id, market_token)
+    if offer_ids is None:
+        offer_ids = await asyncio.to_thread(get_offer_ids, campaign_id, market_token)
     stocks = create_stocks(watch_remnants, offer_ids, warehouse_id)
-    for some_stock in list(divide(stocks, 2000)):
-        update_stocks(some_stock, campaign_id, market_token)
+    url = f"{_MARKET_BASE}campaigns/{campaign_id}/offers/stocks"
+    await send_chunks(
+        "PUT",
+        url,
+        _headers(market_token),
+        "skus",
+        divide(stocks, 2000),
+        limit=_MARKET_STOCKS_LIMIT,
+        client=client,
+    )
     not_empty = list(
         filter(lambda stock: (stock.get("items")[0].get("count") != 0), stocks)
     )
     return not_empty, stocks
 
 
+async def process_campaign(
+    watch_remnants, campaign_id, market_token, warehouse_id, client=None
+):
+    """Обновляет остатки и цены товаров одной кампании Yandex market.
+
+    Args:
+        watch_remnants pd.DataFrame: Таблица с информацией об остатках товара с timeworld.ru.
+        campaign_id (str): Ваш индивидуальный id компании для Yandex market.
+        market_token (str): Ваш индивидуальный токен с Yandex market.
+        warehouse_id (str): ID склада.
+        client (httpx.AsyncClient): Общий клиент из create_client.
+
+    Raises:
+        requests.HTTPError: Если в запросе к API произошла ошибка.
+        httpx.HTTPStatusError: Если при отправке данных произошла ошибка.
+        KeyError: Если в словаре отсутствуют ожидаемые ключи.
+        ValueError: Если количество не удалось преобразовать в число.
+    """
+    offer_ids = await asyncio.to_thread(get_offer_ids, campaign_id, market_token)
+    # Обновить остатки
+    await upload_stocks(
+        watch_remnants,
+        campaign_id,
+        market_token,
+        warehouse_id,
+        offer_ids=offer_ids,
+        client=client,
+    )
+    # Поменять цены
+    await upload_prices(
+        watch_remnants, campaign_id, market_token, offer_ids=offer_ids, client=client
+    )
+
+
+async def process_campaigns(watch_remnants, market_token, campaigns):
+    """Параллельно обновляет остатки и цены в нескольких кампаниях.
+
+    Все кампании отправляют данные через один общий httpx клиент.
+
+    Args:
+        watch_remnants pd.DataFrame: Таблица с информацией об остатках товара с timeworld.ru.
+        market_token (str): Ваш индивидуальный токен с Yandex market.
+        campaigns list[tuple]: Пары (campaign_id, warehouse_id).
+
+    Raises:
+        requests.HTTPError: Если в запросе к API произошла ошибка.
+        httpx.HTTPStatusError: Если при отправке данных произошла ошибка.
+        KeyError: Если в словаре отсутствуют ожидаемые ключи.
+        ValueError: Если количество не удалось преобразовать в число.
+    """
+    async with create_client() as client:
+        await asyncio.gather(
+            *[
+                process_campaign(
+                    watch_remnants,
+                    campaign_id,
+                    market_token,
+                    warehouse_id,
+                    client=client,
+                )
+                for campaign_id, warehouse_id in campaigns
+            ]
+        )
+
+
 def main():
     """
     Основная функция для обновления остатков и цен товаров в Yandex market.
@@ -319,8 +454,12 @@ def main():
     Затем формирует и отправляет обновлённые остатки и цены через API Yandex market.
 
     Raises:
-        requests.exceptions.ReadTimeout: Превышено время ожидания сервера.
-        requests.exceptions.ConnectionError: Ошибка соединения.
+        requests.exceptions.ReadTimeout, httpx.TimeoutException:
+            Превышено время ожидания сервера.
+            Таймаут чтения в requests не повторяется.
+        requests.exceptions.ConnectionError, httpx.TransportError:
+            Ошибка соединения.
+        requests.exceptions.RetryError: Сервер не ответил после повторных попыток.
         Exception: ERROR_2.
     """
     env = Env()
@@ -332,27 +471,18 @@ def main():
 
     watch_remnants = download_stock()
     try:
-        # FBS
-        offer_ids = get_offer_ids(campaign_fbs_id, market_token)
-        # Обновить остатки FBS
-        stocks = create_stocks(watch_remnants, offer_ids, warehouse_fbs_id)
-        for some_stock in list(divide(stocks, 2000)):
-            update_stocks(some_stock, campaign_fbs_id, market_token)
-        # Поменять цены FBS
-        upload_prices(watch_remnants, campaign_fbs_id, market_token)
-
-        # DBS
-        offer_ids = get_offer_ids(campaign_dbs_id, market_token)
-        # Обновить остатки DBS
-        stocks = create_stocks(watch_remnants, offer_ids, warehouse_dbs_id)
-        for some_stock in list(divide(stocks, 2000)):
-            update_stocks(some_stock, campaign_dbs_id, market_token)
-        # Поменять цены DBS
-        upload_prices(watch_remnants, campaign_dbs_id, market_token)
-    except requests.exceptions.ReadTimeout:
+        # FBS и DBS обновляются одновременно
+        campaigns = [
+            (campaign_fbs_id, warehouse_fbs_id),
+            (campaign_dbs_id, warehouse_dbs_id),
+        ]
+        asyncio.run(process_campaigns(watch_remnants, market_token, campaigns))
+    except (requests.exceptions.ReadTimeout, httpx.TimeoutException):
         print("Превышено время ожидания...")
-    except requests.exceptions.ConnectionError as error:
+    except (requests.exceptions.ConnectionError, httpx.TransportError) as error:
         print(error, "Ошибка соединения")
+    except requests.exceptions.RetryError as error:
+        print(error, "Сервер не ответил после повторных попыток")
     except Exception as error:
         print(error, "ERROR_2")
 
@@ -1,15 +1,80 @@
+import asyncio
+import email.utils
+import functools
+import importlib.util
 import io
 import logging.config
-import os
 import re
+import time
 import zipfile
 from environs import Env
 
+import httpx
+import orjson
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__file__)
 
+_DIGITS_RE = re.compile(r"[^0-9]")
+
+# HTTP/2 в httpx работает только с установленным пакетом h2.
+_HTTP2 = importlib.util.find_spec("h2") is not None
+
+# Повторные попытки при временных ошибках API.
+_RETRY_TOTAL = 5
+_RETRY_BACKOFF = 0.5
+_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_OZON_BASE = "https://api-seller.ozon.ru/"
+# Одновременных запросов при отправке частей на OZON.
+# Остатки уходят мелкими частями по 100 шт., поэтому запросов много,
+# а лимит у import/stocks считается по запросам в минуту — держим 2.
+# Цены уходят частями по 1000 шт., запросов единицы — хватает 4.
+_OZON_STOCKS_LIMIT = 2
+_OZON_PRICES_LIMIT = 4
+_CASIO_URL = "https://timeworld.ru/upload/files/ostatki.zip"
+
+_SESSION = requests.Session()
+_SESSION.headers.update({"Content-Type": "application/json"})
+for _host in (_OZON_BASE, "https://timeworld.ru/"):
+    _SESSION.mount(
+        _host,
+        HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(
+                total=_RETRY_TOTAL,
+                backoff_factor=_RETRY_BACKOFF,
+                status_forcelist=_RETRY_STATUSES,
+                allowed_methods=("GET", "PUT", "POST"),
+                respect_retry_after_header=True,
+                # Таймаут чтения не повторяем: запрос мог уже дойти до API,
+                # а requests поднимет ReadTimeout, а не ConnectionError.
+                read=False,
+            ),
+        ),
+    )
+
+
+@functools.lru_cache(maxsize=4)
+def _headers(client_id, seller_token):
+    """Возвращает заголовки авторизации для API OZON.
+
+    Args:
+        client_id (str): Ваш индивидуальный id с OZON.
+        seller_token (str): Ваш индивидуальный токен с OZON.
+
+    Returns:
+        dict: Заголовки запроса. Словарь общий для всех вызовов, его нельзя менять.
+    """
+    return {
+        "Client-Id": client_id,
+        "Api-Key": seller_token,
+    }
+
 
 def get_product_list(last_id, client_id, seller_token):
     """Получает список товаров из маркетплейса OZON.
@@ -29,11 +94,7 @@ def get_product_list(last_id, client_id, seller_token):
     Raises:
         requests.HTTPError: Если в запросе произошла ошибка.
     """
-    url = "https://api-seller.ozon.ru/v2/product/list"
-    headers = {
-        "Client-Id": client_id,
-        "Api-Key": seller_token,
-    }
+    url = _OZON_BASE + "v2/product/list"
     payload = {
         "filter": {
             "visibility": "ALL",
@@ -41,44 +102,65 @@ def get_product_list(last_id, client_id, seller_token):
         "last_id": last_id,
         "limit": 1000,
     }
-    response = requests.post(url, json=payload, headers=headers)
+    response = _SESSION.post(
+        url, data=orjson.dumps(payload), headers=_headers(client_id, seller_token)
+    )
     response.raise_for_status()
     response_object = response.json()
     return response_object.get("result")
 
 
-def get_offer_ids(client_id, seller_token):
-    """Получить артикулы товаров магазина OZON.
+def iter_offer_ids(client_id, seller_token):
+    """Перебирает артикулы товаров магазина OZON.
 
     Функция вызывает get_product_list и получает словарь
     с списком товаров из OZON по 1000 шт за раз.
-    Затем извлекает артикулы товаров из ранее полученного словаря.
-    По итогу создает список артикулов товаров с OZON.
+    Артикулы отдаются по одному, поэтому в памяти
+    хранится не больше одной страницы товаров.
 
     Args:
         client_id (str): Ваш индивидуальный id с OZON.
         seller_token (str): Ваш индивидуальный токен с OZON.
 
-    Returns:
-        list: Список артикулов товаров.
+    Yields:
+        str: Артикул товара.
 
     Raises:
         requests.HTTPError: Если в запросе к API произошла ошибка.
         KeyError: Если в словаре отсутствуют ожидаемые ключи.
     """
     last_id = ""
-    product_list = []
+    received = 0
     while True:
         some_prod = get_product_list(last_id, client_id, seller_token)
-        product_list.extend(some_prod.get("items"))
+        items = some_prod.get("items")
         total = some_prod.get("total")
         last_id = some_prod.get("last_id")
-        if total == len(product_list):
+        received += len(items)
+        for product in items:
+            yield product["offer_id"]
+        if not items or total <= received:
             break
-    offer_ids = []
-    for product in product_list:
-        offer_ids.append(product.get("offer_id"))
-    return offer_ids
+
+
+def get_offer_ids(client_id, seller_token):
+    """Получить артикулы товаров магазина OZON.
+
+    Функция собирает в множество артикулы, полученные из iter_offer_ids.
+    Множество строится один раз и передаётся в create_stocks и create_prices.
+
+    Args:
+        client_id (str): Ваш индивидуальный id с OZON.
+        seller_token (str): Ваш индивидуальный токен с OZON.
+
+    Returns:
+        set: Множество артикулов товаров.
+
+    Raises:
+        requests.HTTPError: Если в запросе к API произошла ошибка.
+        KeyError: Если в словаре отсутствуют ожидаемые ключи.
+    """
+    return set(iter_offer_ids(client_id, seller_token))
 
 
 def update_price(prices: list, client_id, seller_token):
@@ -98,13 +180,11 @@ def update_price(prices: list, client_id, seller_token):
     Raises:
         requests.HTTPError: Если в запросе к API произошла ошибка.
     """
-    url = "https://api-seller.ozon.ru/v1/product/import/prices"
-    headers = {
-        "Client-Id": client_id,
-        "Api-Key": seller_token,
-    }
+    url = _OZON_BASE + "v1/product/import/prices"
     payload = {"prices": prices}
-    response = requests.post(url, json=payload, headers=headers)
+    response = _SESSION.post(
+        url, data=orjson.dumps(payload), headers=_headers(client_id, seller_token)
+    )
     response.raise_for_status()
     return response.json()
 
@@ -126,13 +206,11 @@ def update_stocks(stocks: list, client_id, seller_token):
     Raises:
         requests.HTTPError: Если в запросе к API произошла ошибка.
     """
-    url = "https://api-seller.ozon.ru/v1/product/import/stocks"
-    headers = {
-        "Client-Id": client_id,
-        "Api-Key": seller_token,
-    }
+    url = _OZON_BASE + "v1/product/import/stocks"
     payload = {"stocks": stocks}
-    response = requests.post(url, json=payload, headers=headers)
+    response = _SESSION.post(
+        url, data=orjson.dumps(payload), headers=_headers(client_id, seller_token)
+    )
     response.raise_for_status()
     return response.json()
 
@@ -142,50 +220,45 @@ def download_stock():
 
     Функция с помощью GET запроса к API timeworld.ru
     скачивает информацию об остатках товара архив ostatki.zip.
-    Извлекает из архива exel файл ostatki.xls и берёт из него данные
-    создавая список словарей с информацией об остатках товара.
-    После удаляет уже не нужный ostatki.xls.
+    Читает exel файл ostatki.xls прямо из архива в памяти
+    и создаёт из него таблицу с информацией об остатках товара.
 
     Returns:
-        list[dict]: Список словарей с информацией об остатках товара.
+        pd.DataFrame: Таблица с информацией об остатках товара.
 
     Raises:
         requests.HTTPError: Если в запросе к API произошла ошибка.
     """
     # Скачать остатки с сайта
-    casio_url = "https://timeworld.ru/upload/files/ostatki.zip"
-    session = requests.Session()
-    response = session.get(casio_url)
+    response = _SESSION.get(_CASIO_URL)
     response.raise_for_status()
-    with response, zipfile.ZipFile(io.BytesIO(response.content)) as archive:
-        archive.extractall(".")
     # Создаем список остатков часов:
-    excel_file = "ostatki.xls"
-    watch_remnants = pd.read_excel(
-        io=excel_file,
-        na_values=None,
-        keep_default_na=False,
-        header=17,
-    ).to_dict(orient="records")
-    os.remove("./ostatki.xls")  # Удалить файл
+    with response, zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+        with archive.open("ostatki.xls") as excel_file:
+            watch_remnants = pd.read_excel(
+                io=excel_file,
+                na_values=None,
+                keep_default_na=False,
+                header=17,
+            )
     return watch_remnants
 
 
 def create_stocks(watch_remnants, offer_ids):
     """Создаёт список остатков товара.
 
-    Функция обрабатывает данные обоих списков и сравнивает их между собой
+    Функция обрабатывает данные таблицы и списка и сравнивает их между собой
     по артикулам создавая новый список словарей.
-    Изменяет количество товара опираясь на данные из списка watch_remnants.
+    Изменяет количество товара опираясь на данные из таблицы watch_remnants.
     Товаров >10 = 100шт.
     Товар 1 = 0.
     Либо = реальное количество товара.
     Если в списках нет совпадений то такому товару присваивается остаток - 0.
 
     Args:
-        watch_remnants list[dict]: Список словарей.
+        watch_remnants pd.DataFrame: Таблица
         с информацией об остатках товара с timeworld.ru.
-        offer_ids list: Список артикулов товаров с OZON.
+        offer_ids set: Артикулы товаров с OZON.
 
     Returns:
         list[dict]: Общий список словарей с информацией об остатках товаров
@@ -193,57 +266,57 @@ def create_stocks(watch_remnants, offer_ids):
 
     Raises:
         ValueError: Если количество не удалось преобразовать в число.
-        KeyError: Если в словаре отсутствуют ожидаемые ключи.
+        KeyError: Если в таблице отсутствуют ожидаемые столбцы.
     """
     # Уберем то, что не загружено в seller
-    stocks = []
-    for watch in watch_remnants:
-        if str(watch.get("Код")) in offer_ids:
-            count = str(watch.get("Количество"))
-            if count == ">10":
-                stock = 100
-            elif count == "1":
-                stock = 0
-            else:
-                stock = int(watch.get("Количество"))
-            stocks.append({"offer_id": str(watch.get("Код")), "stock": stock})
-            offer_ids.remove(str(watch.get("Код")))
+    offer_set = offer_ids if isinstance(offer_ids, set) else set(offer_ids)
+    codes = watch_remnants["Код"].astype(str)
+    matched = codes.isin(offer_set) & ~codes.duplicated()
+    matched_codes = codes[matched].tolist()
+    counts = stock_conversion(watch_remnants.loc[matched, "Количество"])
+    stocks = [
+        {"offer_id": code, "stock": stock}
+        for code, stock in zip(matched_codes, counts.tolist())
+    ]
     # Добавим недостающее из загруженного:
-    for offer_id in offer_ids:
-        stocks.append({"offer_id": offer_id, "stock": 0})
+    remaining = offer_set.difference(matched_codes)
+    stocks.extend({"offer_id": offer_id, "stock": 0} for offer_id in remaining)
     return stocks
 
 
 def create_prices(watch_remnants, offer_ids):
     """Создаёт новый список с актуальными ценами на товары.
 
-    Функция перебирает товары в из списка watch_remnants
+    Функция перебирает товары из таблицы watch_remnants
     и сравнивает по id с товарами в списке offer_ids.
     Если id совпадают, то товар отправляется в новый список словарей
-    с обновленной ценой взятой из первого списка.
+    с обновленной ценой взятой из таблицы.
 
     Args:
-        watch_remnants list[dict]: Список словарей.
+        watch_remnants pd.DataFrame: Таблица
         с информацией об остатках товара с timeworld.ru.
-        offer_ids list: Список артикулов товаров с OZON.
+        offer_ids set: Артикулы товаров с OZON.
 
     Returns:
         list[dict]: Список словарей с актуальной ценой на товары.
 
     Raises:
-        KeyError: Если в словаре отсутствуют ожидаемые ключи.
+        KeyError: Если в таблице отсутствуют ожидаемые столбцы.
     """
-    prices = []
-    for watch in watch_remnants:
-        if str(watch.get("Код")) in offer_ids:
-            price = {
-                "auto_action_enabled": "UNKNOWN",
-                "currency_code": "RUB",
-                "offer_id": str(watch.get("Код")),
-                "old_price": "0",
-                "price": price_conversion(watch.get("Цена")),
-            }
-            prices.append(price)
+    offer_set = offer_ids if isinstance(offer_ids, set) else set(offer_ids)
+    codes = watch_remnants["Код"].astype(str)
+    matched = codes.isin(offer_set)
+    new_prices = prices_conversion(watch_remnants.loc[matched, "Цена"])
+    prices = [
+        {
+            "auto_action_enabled": "UNKNOWN",
+            "currency_code": "RUB",
+            "offer_id": code,
+            "old_price": "0",
+            "price": new_price,
+        }
+        for code, new_price in zip(codes[matched].tolist(), new_prices.tolist())
+    ]
     return prices
 
 
@@ -264,7 +337,58 @@ def price_conversion(price: str) -> str:
         >>>print(price_conversion(a)
         '5990'
     """
-    return re.sub("[^0-9]", "", price.split(".")[0])
+    return _DIGITS_RE.sub("", price.split(".", 1)[0])
+
+
+def prices_conversion(prices: pd.Series) -> pd.Series:
+    """Преобразовывает столбец цен в целые числа.
+
+    Векторный вариант price_conversion для столбца таблицы.
+
+    Args:
+        prices: Столбец с ценами товаров.
+
+    Returns:
+        Столбец целых чисел в формате строки без посторонних символов.
+
+    Exemples:
+        >>>a = pd.Series(["5'990.00 руб", "12'500.50 руб"])
+        >>>print(prices_conversion(a).tolist())
+        ['5990', '12500']
+    """
+    return (
+        prices.astype(str)
+        .str.split(".", n=1)
+        .str[0]
+        .str.replace(_DIGITS_RE, "", regex=True)
+    )
+
+
+def stock_conversion(counts: pd.Series) -> pd.Series:
+    """Преобразовывает столбец остатков в количество товара.
+
+    Товаров >10 = 100шт.
+    Товар 1 = 0.
+    Либо = реальное количество товара.
+
+    Args:
+        counts: Столбец с остатками товара.
+
+    Returns:
+        Столбец целых чисел с количеством товара.
+
+    Raises:
+        ValueError: Если количество не удалось преобразовать в число.
+
+    Exemples:
+        >>>a = pd.Series([">10", "1", 5])
+        >>>print(stock_conversion(a).tolist())
+        [100, 0, 5]
+    """
+    counts = counts.astype(str)
+    stocks = counts.mask(counts.isin([">10", "1"]), "0")
+    stocks = pd.to_numeric(stocks).astype(int)
+    return stocks.mask(counts == ">10", 100)
 
 
 def divide(lst: list, n: int):
@@ -290,37 +414,164 @@ def divide(lst: list, n: int):
         yield lst[i: i + n]
 
 
-async def upload_prices(watch_remnants, client_id, seller_token):
+def create_client():
+    """Создаёт httpx клиент для отправки частей списка на API.
+
+    Клиент работает по HTTP/2, если установлен пакет h2,
+    иначе по HTTP/1.1. Ошибки установки соединения
+    повторяются транспортом до трёх раз.
+
+    Returns:
+        httpx.AsyncClient: Новый клиент, закрывается через async with.
+    """
+    limits = httpx.Limits(max_connections=32, max_keepalive_connections=16)
+    transport = httpx.AsyncHTTPTransport(http2=_HTTP2, limits=limits, retries=3)
+    return httpx.AsyncClient(transport=transport, timeout=30.0)
+
+
+def _retry_delay(response, attempt):
+    """Считает паузу перед повторной попыткой запроса.
+
+    Если сервер прислал заголовок Retry-After, ждём столько, сколько он просит,
+    иначе экспоненциально: _RETRY_BACKOFF * 2 ** attempt секунд.
+
+    Args:
+        response (httpx.Response): Ответ с временной ошибкой.
+        attempt (int): Номер попытки, начиная с 0.
+
+    Returns:
+        float: Пауза в секундах.
+    """
+    delay = _RETRY_BACKOFF * 2 ** attempt
+    retry_after = response.headers.get("Retry-After")
+    if not retry_after:
+        return delay
+    if retry_after.isdigit():
+        return max(delay, int(retry_after))
+    try:
+        retry_at = email.utils.parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return delay
+    wait = retry_at.timestamp() - time.time()
+    return max(delay, wait)
+
+
+async def send_json(client, method, url, headers, payload):
+    """Отправляет JSON запрос через httpx клиент.
+
+    При ответах 429 и 5xx запрос повторяется до _RETRY_TOTAL раз
+    с экспоненциальной паузой и с учётом заголовка Retry-After.
+
+    Args:
+        client (httpx.AsyncClient): Открытый клиент.
+        method (str): HTTP метод, например "POST".
+        url (str): Адрес API.
+        headers (dict): Заголовки запроса.
+        payload (dict): Тело запроса.
+
+    Returns:
+        dict: Ответ API.
+
+    Raises:
+        httpx.HTTPStatusError: Если в запросе к API произошла ошибка.
+    """
+    content = orjson.dumps(payload)
+    for attempt in range(_RETRY_TOTAL + 1):
+        response = await client.request(method, url, headers=headers, content=content)
+        if response.status_code not in _RETRY_STATUSES or attempt == _RETRY_TOTAL:
+            break
+        await asyncio.sleep(_retry_delay(response, attempt))
+    response.raise_for_status()
+    return response.json()
+
+
+async def send_chunks(method, url, headers, key, chunks, limit=4, client=None):
+    """Параллельно отправляет части списка на API.
+
+    Все части отправляются через один httpx клиент,
+    по HTTP/2 запросы мультиплексируются в одном соединении.
+    Одновременно выполняется не более limit запросов.
+
+    Args:
+        method (str): HTTP метод, например "POST".
+        url (str): Адрес API.
+        headers (dict): Заголовки запросов.
+        key (str): Ключ, под которым часть списка кладётся в тело запроса.
+        chunks: Части списка, полученные из divide.
+        limit: Максимальное количество одновременных запросов.
+            Задаётся под лимиты конкретного API.
+        client (httpx.AsyncClient): Общий клиент из create_client.
+            Если не передан, создаётся клиент только для этого вызова.
+
+    Returns:
+        list: Ответы API в порядке частей.
+
+    Raises:
+        httpx.HTTPStatusError: Если в запросе к API произошла ошибка.
+    """
+    if client is None:
+        async with create_client() as client:
+            return await send_chunks(
+                method, url, headers, key, chunks, limit=limit, client=client
+            )
+    headers = {"Content-Type": "application/json", **headers}
+    semaphore = asyncio.Semaphore(limit)
+
+    async def send(chunk):
+        async with semaphore:
+            return await send_json(client, method, url, headers, {key: chunk})
+
+    return await asyncio.gather(*[send(chunk) for chunk in chunks])
+
+
+async def upload_prices(
+    watch_remnants, client_id, seller_token, offer_ids=None, client=None
+):
     """Обновляет цены товаров на OZON.
 
     Args:
-        watch_remnants list[dict]: Список словарей с информацией об остатках товара с timeworld.ru.
+        watch_remnants pd.DataFrame: Таблица с информацией об остатках товара с timeworld.ru.
         client_id (str): Ваш индивидуальный id с OZON.
         seller_token (str): Ваш индивидуальный токен с OZON.
+        offer_ids set: Артикулы товаров с OZON.
+            Если не передан, будет получен через get_offer_ids.
+        client (httpx.AsyncClient): Общий клиент из create_client.
 
     Returns:
         list[dict]: Список словарей с актуальной ценой на товары.
 
     Raises:
         requests.HTTPError: Если в запросе к API произошла ошибка.
+        httpx.HTTPStatusError: Если при отправке цен произошла ошибка.
         KeyError: Если в словаре отсутствуют ожидаемые ключи.
-        KeyError: Если в словаре отсутствуют ожидаемые ключи.
-        requests.HTTPError: Если в запросе к API произошла ошибка.
     """
-    offer_ids = get_offer_ids(client_id, seller_token)
+    if offer_ids is None:
+        offer_ids = await asyncio.to_thread(get_offer_ids, client_id, seller_token)
     prices = create_prices(watch_remnants, offer_ids)
-    for some_price in list(divide(prices, 1000)):
-        update_price(some_price, client_id, seller_token)
+    await send_chunks(
+        "POST",
+        _OZON_BASE + "v1/product/import/prices",
+        _headers(client_id, seller_token),
+        "prices",
+        divide(prices, 1000),
+        limit=_OZON_PRICES_LIMIT,
+        client=client,
+    )
     return prices
 
 
-async def upload_stocks(watch_remnants, client_id, seller_token):
+async def upload_stocks(
+    watch_remnants, client_id, seller_token, offer_ids=None, client=None
+):
     """Обновляет остатки товаров на OZON.
 
     Args:
-        watch_remnants list[dict]: Список словарей с информацией об остатках товара с timeworld.ru.
+        watch_remnants pd.DataFrame: Таблица с информацией об остатках товара с timeworld.ru.
         client_id (str): Ваш индивидуальный id с OZON.
         seller_token (str): Ваш индивидуальный токен с OZON.
+        offer_ids set: Артикулы товаров с OZON.
+            Если не передан, будет получен через get_offer_ids.
+        client (httpx.AsyncClient): Общий клиент из create_client.
 
     Returns:
         stocks list[dict]: Общий список словарей с информацией об остатках товаров
@@ -329,13 +580,22 @@ async def upload_stocks(watch_remnants, client_id, seller_token):
 
     Raises:
         requests.HTTPError: Если в запросе к API произошла ошибка.
+        httpx.HTTPStatusError: Если при отправке остатков произошла ошибка.
         ValueError: Если количество не удалось преобразовать в число.
         KeyError: Если в словаре отсутствуют ожидаемые ключи.
     """
-    offer_ids = get_offer_ids(client_id, seller_token)
+    if offer_ids is None:
+        offer_ids = await asyncio.to_thread(get_offer_ids, client_id, seller_token)
     stocks = create_stocks(watch_remnants, offer_ids)
-    for some_stock in list(divide(stocks, 100)):
-        update_stocks(some_stock, client_id, seller_token)
+    await send_chunks(
+        "POST",
+        _OZON_BASE + "v1/product/import/stocks",
+        _headers(client_id, seller_token),
+        "stocks",
+        divide(stocks, 100),
+        limit=_OZON_STOCKS_LIMIT,
+        client=client,
+    )
     not_empty = list(filter(lambda stock: (stock.get("stock") != 0), stocks))
     return not_empty, stocks
 
@@ -350,7 +610,9 @@ def main():
 
     Raises:
         requests.exceptions.ReadTimeout: Превышено время ожидания сервера.
+            Таймаут чтения не повторяется.
         requests.exceptions.ConnectionError: Ошибка соединения.
+        requests.exceptions.RetryError: Сервер не ответил после повторных попыток.
         Exception: ERROR_2.
     """
     env = Env()
@@ -361,16 +623,18 @@ def main():
         watch_remnants = download_stock()
         # Обновить остатки
         stocks = create_stocks(watch_remnants, offer_ids)
-        for some_stock in list(divide(stocks, 100)):
+        for some_stock in divide(stocks, 100):
             update_stocks(some_stock, client_id, seller_token)
         # Поменять цены
         prices = create_prices(watch_remnants, offer_ids)
-        for some_price in list(divide(prices, 900)):
+        for some_price in divide(prices, 900):
             update_price(some_price, client_id, seller_token)
     except requests.exceptions.ReadTimeout:
         print("Превышено время ожидания...")
     except requests.exceptions.ConnectionError as error:
         print(error, "Ошибка соединения")
+    except requests.exceptions.RetryError as error:
+        print(error, "Сервер не ответил после повторных попыток")
     except Exception as error:
         print(error, "ERROR_2")
 